@@ -4,52 +4,133 @@ Claude Code Status Line
 Reads JSON from stdin and outputs a formatted single-line status display
 """
 
+from __future__ import annotations
+
+import functools
 import json
+import mmap
+import os
+import re
 import sys
-import subprocess
+import time
+from collections.abc import Callable, Mapping
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, Dict, Any
+from stat import S_ISDIR, S_ISREG, S_ISSOCK
+from types import MappingProxyType
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Where git and transcript caches are kept between renders: a per-user directory in the temp
+# dir, so other users can neither read nor plant entries. Same environment lookup as
+# tempfile.gettempdir(), minus its import and the probe file it writes on every start.
+CACHE_DIR = Path(
+    os.environ.get('TMPDIR') or os.environ.get('TEMP') or os.environ.get('TMP') or '/tmp',
+    f'claude_statusline-{os.getuid()}'
+)
+
+
+def _is_private_dir(path: str | Path) -> bool:
+    """Whether path is a directory owned by us that nobody else can access"""
+    try:
+        stat = os.lstat(path)
+    except OSError:
+        return False
+    return S_ISDIR(stat.st_mode) and stat.st_uid == os.getuid() and not stat.st_mode & 0o077
+
+
+def _cache_file(name: str) -> Path | None:
+    """Path of a cache file in CACHE_DIR, or None if that directory isn't private to us"""
+    if not _is_private_dir(CACHE_DIR):
+        try:
+            os.mkdir(CACHE_DIR, 0o700)
+        except OSError:
+            # Someone else's directory, or not one at all: don't cache rather than trust it
+            return None
+    return CACHE_DIR / name
+
+
+def _read_cache(cache_path: Path) -> dict | None:
+    """Load a JSON cache file, returning None if it is missing or unreadable"""
+    try:
+        with open(cache_path, 'r') as f:
+            entry = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def _write_cache(cache_path: Path, entry: dict):
+    """Atomically write a JSON cache file so concurrent renders never see a partial file"""
+    tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+    try:
+        # Never follow or reuse whatever might already be at the temporary name
+        fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, cache_path)
+    except (IOError, OSError, TypeError, ValueError):
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
 
 
 class Config:
     """Load and manage configuration"""
 
-    DEFAULT_CONFIG = {
+    # Read-only so it can be shared by every Config without copying
+    DEFAULT_CONFIG = MappingProxyType({
         "colors": True,
-        "icons": {
+        "icons": MappingProxyType({
             "clean": "✅",
             "dirty": "🚧",
             "ahead": "⇡",
             "behind": "⇣",
             "high_usage": "⚠️"
-        }
-    }
-
-    def __init__(self, config_path: Optional[str] = None):
-        self.config = self.DEFAULT_CONFIG.copy()
+        })
+    })
 
+    def __init__(self, config_path: str | None = None):
         if config_path is None:
             script_dir = Path(__file__).parent
             config_path = script_dir / 'config.json'
 
-        if Path(config_path).exists():
-            try:
-                with open(config_path, 'r') as f:
-                    user_config = json.load(f)
-                    self._merge_config(user_config)
-            except (json.JSONDecodeError, IOError):
-                pass
-
-    def _merge_config(self, user_config: Dict[str, Any]):
-        """Recursively merge user config with defaults"""
-        def merge(base, override):
+        # A single stat answers both "is there a config" and "has it changed". Files too
+        # small to hold anything beyond "{}" are treated as absent and never opened.
+        try:
+            stat = os.stat(config_path)
+            mtime = stat.st_mtime_ns if stat.st_size > 2 else None
+        except OSError:
+            mtime = None
+
+        self.config = _load_config(str(config_path), mtime)
+
+    @classmethod
+    def _merge_config(cls, user_config: dict) -> Mapping:
+        """Merge user config over the defaults without modifying DEFAULT_CONFIG"""
+        if not user_config or not isinstance(user_config, dict):
+            return cls.DEFAULT_CONFIG
+
+        config = dict(cls.DEFAULT_CONFIG)
+        stack = [(config, user_config)]
+        while stack:
+            base, override = stack.pop()
             for key, value in override.items():
-                if isinstance(value, dict) and key in base:
-                    merge(base[key], value)
+                if isinstance(value, dict) and isinstance(base.get(key), Mapping):
+                    # Copy nested mappings on the way down so the defaults stay untouched
+                    base[key] = dict(base[key])
+                    stack.append((base[key], value))
                 else:
                     base[key] = value
-        merge(self.config, user_config)
+        return MappingProxyType(config)
 
     def get(self, *keys):
         """Get nested config value"""
@@ -59,48 +140,171 @@ class Config:
         return value
 
 
+@functools.lru_cache(maxsize=1)
+def _load_config(config_path: str, mtime: int | None) -> Mapping:
+    """Read and merge config.json, reusing the result until its mtime changes"""
+    if mtime is None:
+        return Config.DEFAULT_CONFIG
+
+    try:
+        with open(config_path, 'r') as f:
+            user_config = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return Config.DEFAULT_CONFIG
+    return Config._merge_config(user_config)
+
+
 class TranscriptParser:
     """Parse Claude Code transcript file to extract session metrics"""
 
-    def __init__(self, transcript_path: Optional[str] = None):
+    # Sidecar caches for transcripts untouched this long belong to finished sessions
+    CACHE_MAX_AGE = 3 * 24 * 60 * 60
+
+    # Prefilter only: the pattern can also match nested entries (e.g. subagent progress), so
+    # lines it accepts are still decoded and checked at the top level by _process_entry
+    ASSISTANT_RE = re.compile(rb'"type"\s*:\s*"assistant"')
+
+    def __init__(self, transcript_path: str | None = None):
         self.transcript_path = transcript_path
         self.metrics = {
             'total_input_tokens': 0,
             'total_output_tokens': 0,
             'assistant_message_count': 0,
             'session_start_time': None,
+            'session_start_epoch': None,
         }
 
         if transcript_path and Path(transcript_path).exists():
             self._parse()
 
     def _parse(self):
-        """Parse the transcript file and extract metrics"""
+        """Parse the transcript file, resuming after the lines seen by the previous render"""
         try:
-            with open(self.transcript_path, 'r') as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line.strip())
-                        self._process_entry(entry)
-                    except json.JSONDecodeError:
+            with open(self.transcript_path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                cache_path = _cache_file(f'claude_statusline_tx_{stat.st_dev}_{stat.st_ino}.json')
+                start_offset = self._load_cache(cache_path, stat) if cache_path else 0
+                if stat.st_size <= start_offset:
+                    return
+
+                # Scan the mapped file in place so no per-line objects are created
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    end = len(mm)
+                    offset = start_offset
+                    newline = mm.find(b'\n', offset)
+                    while newline != -1:
+                        self._process_line(mm, offset, newline)
+                        offset = newline + 1
+                        newline = mm.find(b'\n', offset)
+
+                    if cache_path and offset != start_offset:
+                        # A fresh parse means a new session, which is rare enough to tidy up on
+                        if start_offset == 0:
+                            self._prune_caches()
+                        _write_cache(cache_path, {
+                            'path': str(self.transcript_path),
+                            'device': stat.st_dev,
+                            'inode': stat.st_ino,
+                            'offset': offset,
+                            'metrics': self.metrics,
+                        })
+
+                    # Last line is still being written; count it now but re-read it next time
+                    if offset < end:
+                        self._process_line(mm, offset, end)
+        except (IOError, OSError, ValueError):
+            pass
+
+    def _load_cache(self, cache_path: Path, stat: os.stat_result) -> int:
+        """Restore metrics from the sidecar cache and return the offset to resume from"""
+        entry = _read_cache(cache_path)
+        if not entry or entry.get('path') != str(self.transcript_path):
+            return 0
+        if entry.get('device') != stat.st_dev or entry.get('inode') != stat.st_ino:
+            return 0
+
+        offset = entry.get('offset')
+        metrics = entry.get('metrics')
+        # A transcript that shrank was rewritten, so start over
+        if not isinstance(offset, int) or not isinstance(metrics, dict) or offset > stat.st_size:
+            return 0
+        # Caches written before a metric was added can't be resumed from
+        if metrics.keys() != self.metrics.keys():
+            return 0
+        # Nor can a corrupt one; wrong types would only fail later, in the middle of a render
+        for key in ('total_input_tokens', 'total_output_tokens', 'assistant_message_count'):
+            if type(metrics[key]) is not int:
+                return 0
+        if not isinstance(metrics['session_start_time'], (str, type(None))):
+            return 0
+        if not isinstance(metrics['session_start_epoch'], (float, type(None))):
+            return 0
+
+        self.metrics.update(metrics)
+        return offset
+
+    def _prune_caches(self):
+        """Remove sidecar caches that haven't been updated for CACHE_MAX_AGE"""
+        cutoff = time.time() - self.CACHE_MAX_AGE
+        try:
+            with os.scandir(CACHE_DIR) as entries:
+                for entry in entries:
+                    if not entry.name.startswith('claude_statusline_tx_'):
                         continue
-        except (IOError, OSError):
+                    try:
+                        if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                            os.unlink(entry.path)
+                    except OSError:
+                        pass
+        except OSError:
             pass
 
-    def _process_entry(self, entry: Dict[str, Any]):
+    def _process_line(self, buf: mmap.mmap, start: int, end: int):
+        """Decode the transcript line at buf[start:end] if it can change the metrics"""
+        # Once the session start is known only assistant entries matter. A plain substring
+        # search rejects the other lines (mostly large tool results) without decoding them.
+        if self.metrics['session_start_time']:
+            if buf.find(b'"assistant"', start, end) == -1:
+                return
+            if not self.ASSISTANT_RE.search(buf, start, end):
+                return
+
+        try:
+            entry = json_loads(buf[start:end])
+        except ValueError:
+            return
+        if isinstance(entry, dict):
+            self._process_entry(entry)
+
+    def _process_entry(self, entry: dict):
         """Process a single transcript entry"""
         entry_type = entry.get('type')
         timestamp = entry.get('timestamp')
 
         if timestamp and not self.metrics['session_start_time']:
-            self.metrics['session_start_time'] = timestamp
+            self._set_session_start(timestamp)
 
         if entry_type == 'assistant':
             self.metrics['assistant_message_count'] += 1
-            message = entry.get('message', {})
-            usage = message.get('usage', {})
-            self.metrics['total_input_tokens'] += usage.get('input_tokens', 0)
-            self.metrics['total_output_tokens'] += usage.get('output_tokens', 0)
+            message = entry.get('message')
+            usage = message.get('usage') if isinstance(message, dict) else None
+            if isinstance(usage, dict):
+                self.metrics['total_input_tokens'] += usage.get('input_tokens') or 0
+                self.metrics['total_output_tokens'] += usage.get('output_tokens') or 0
+
+    def _set_session_start(self, timestamp: str):
+        """Record the session start, converted once to epoch seconds and cached with the metrics"""
+        self.metrics['session_start_time'] = timestamp
+
+        from datetime import datetime
+
+        try:
+            # Python < 3.11 fromisoformat doesn't accept a trailing Z
+            if timestamp.endswith('Z'):
+                timestamp = timestamp[:-1] + '+00:00'
+            self.metrics['session_start_epoch'] = datetime.fromisoformat(timestamp).timestamp()
+        except (ValueError, TypeError, AttributeError):
+            self.metrics['session_start_epoch'] = None
 
     def get(self, key: str, default=None):
         """Get a metric value"""
@@ -110,54 +314,203 @@ class TranscriptParser:
 class GitInfo:
     """Extract git repository information"""
 
+    # Seconds a cached status is reused while .git/index and .git/HEAD are unchanged
+    CACHE_TTL = 5
+
+    # We only read, so never take index.lock, and skip walking dirty submodule worktrees
+    GIT_OPTIONS = (
+        '--no-optional-locks',
+        '-c', 'diff.ignoreSubmodules=dirty',
+        '-c', 'status.submoduleSummary=false',
+    )
+
+    # Upper bound on a git call. With output pipes, subprocess enforces this on POSIX by
+    # polling inside communicate(): no helper thread, alarm or extra process is involved.
+    GIT_TIMEOUT = 1
+
+    # Absolute path of the git executable, resolved once per process
+    _git_path: str | None = None
+
     def __init__(self, workspace_dir: str):
         self.workspace_dir = workspace_dir
+        self._status: tuple[str | None, bool, int, int] | None = None
 
-    def get_branch(self) -> Optional[str]:
-        """Get current git branch name"""
+    @classmethod
+    def _git_executable(cls) -> str | None:
+        """Resolve git on PATH"""
+        if cls._git_path is None:
+            import shutil
+
+            cls._git_path = shutil.which('git')
+        return cls._git_path
+
+    def _run_git(self, *args: str) -> bytes | None:
+        """Run a git command in the workspace, returning stdout or None on failure"""
+        import subprocess
+
+        git = self._git_executable()
+        if git is None:
+            return None
+
+        # An absolute executable, no cwd and close_fds=False let CPython start git with
+        # posix_spawn instead of fork + closing every fd up to the limit. Python-created
+        # fds are non-inheritable anyway, so nothing extra leaks into git.
         try:
             result = subprocess.run(
-                ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-                cwd=self.workspace_dir,
+                [git, *self.GIT_OPTIONS, '-C', self.workspace_dir, *args],
                 capture_output=True,
-                text=True,
-                timeout=1
+                timeout=self.GIT_TIMEOUT,
+                close_fds=False
             )
-            return result.stdout.strip() if result.returncode == 0 else None
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+        except (subprocess.TimeoutExpired, OSError):
             return None
 
+        return result.stdout if result.returncode == 0 else None
+
+    @functools.cached_property
+    def git_dir(self) -> Path | None:
+        """Git directory found by walking up from the workspace, or None outside a repo"""
+        path = os.path.abspath(self.workspace_dir)
+        while True:
+            dot_git = os.path.join(path, '.git')
+            # One stat per level tells us both whether .git exists and what it is
+            try:
+                mode = os.stat(dot_git).st_mode
+            except OSError:
+                parent = os.path.dirname(path)
+                if parent == path:
+                    return None
+                path = parent
+                continue
+
+            if S_ISDIR(mode):
+                return Path(dot_git)
+            if not S_ISREG(mode):
+                return None
+
+            # Worktrees and submodules use a .git file pointing at the real git directory
+            try:
+                with open(dot_git, 'r') as f:
+                    content = f.read().strip()
+            except (IOError, OSError):
+                return None
+            if content.startswith('gitdir:'):
+                return Path(path, content[len('gitdir:'):].strip())
+            return None
+
+    def get_all(self) -> tuple[str | None, bool, int, int]:
+        """Get branch, dirty flag and ahead/behind counts (returns branch, dirty, ahead, behind)"""
+        if self._status is None:
+            mtimes = self._git_mtimes()
+            cache_path = self._cache_path() if mtimes else None
+            status = self._load_cached_status(cache_path, mtimes) if cache_path else None
+            if status is None:
+                status = self._read_status()
+                if cache_path:
+                    self._save_cached_status(cache_path, mtimes, status)
+            self._status = status
+        return self._status
+
+    def _git_mtimes(self) -> list[int] | None:
+        """mtimes of .git/index and .git/HEAD, which change with any commit, checkout or add"""
+        git_dir = self.git_dir
+        if git_dir is None:
+            return None
+
+        try:
+            head_mtime = os.stat(git_dir / 'HEAD').st_mtime_ns
+        except OSError:
+            return None
+        try:
+            index_mtime = os.stat(git_dir / 'index').st_mtime_ns
+        except OSError:
+            # Fresh repositories have no index until the first `git add`
+            index_mtime = 0
+        return [index_mtime, head_mtime]
+
+    def _cache_path(self) -> Path | None:
+        """Cache file keyed by workspace only, so each repository reuses a single file"""
+        import hashlib
+
+        key_source = str(Path(self.workspace_dir).absolute())
+        key = hashlib.blake2b(key_source.encode()).hexdigest()[:16]
+        return _cache_file(f'claude_statusline_git_{key}.json')
+
+    def _load_cached_status(
+        self, cache_path: Path, mtimes: list[int]
+    ) -> tuple[str | None, bool, int, int] | None:
+        """Return the cached status if it is younger than CACHE_TTL and git state is unchanged"""
+        entry = _read_cache(cache_path)
+        try:
+            if (entry and entry['mtimes'] == mtimes
+                    and time.time() - entry['time'] < self.CACHE_TTL):
+                branch, dirty, ahead, behind = entry['status']
+                return branch, dirty, ahead, behind
+        except (KeyError, TypeError, ValueError):
+            pass
+        return None
+
+    def _save_cached_status(
+        self, cache_path: Path, mtimes: list[int], status: tuple[str | None, bool, int, int]
+    ):
+        """Store the status together with the time it was read and the mtimes it is valid for"""
+        _write_cache(cache_path, {'time': time.time(), 'mtimes': mtimes, 'status': list(status)})
+
+    def _read_status(self) -> tuple[str | None, bool, int, int]:
+        """Query everything from a single `git status --porcelain=v2 --branch` call"""
+        output = self._run_git('status', '--porcelain=v2', '--branch')
+        if output is None:
+            return None, False, 0, 0
+        return self._parse_status(output)
+
+    @staticmethod
+    def _parse_status(output: bytes) -> tuple[str | None, bool, int, int]:
+        """Parse `git status --porcelain=v2 --branch` output into branch, dirty, ahead, behind"""
+        # Work on the raw bytes: only the short header block at the top is of interest, and
+        # any line after it is a changed entry, so the rest never needs splitting or decoding
+        branch = None
+        upstream = False
+        ab_start = ab_end = -1
+        pos = 0
+        while output.startswith(b'# ', pos):
+            newline = output.find(b'\n', pos)
+            if newline == -1:
+                newline = len(output)
+            if output.startswith(b'# branch.head ', pos):
+                branch = output[pos + len(b'# branch.head '):newline].decode(errors='replace')
+                if branch == '(detached)':
+                    branch = 'HEAD'
+            elif output.startswith(b'# branch.upstream ', pos):
+                upstream = True
+            elif output.startswith(b'# branch.ab ', pos):
+                ab_start, ab_end = pos + len(b'# branch.ab '), newline
+            pos = newline + 1
+        dirty = pos < len(output)
+
+        # Branches without an upstream (typical for unpushed feature branches) have nothing to
+        # compare against; an upstream that was deleted on the remote reports no counts either
+        if not upstream or ab_start == -1:
+            return branch, dirty, 0, 0
+
+        # "+<ahead> -<behind>"
+        space = output.find(b' ', ab_start, ab_end)
+        try:
+            return branch, dirty, int(output[ab_start + 1:space]), int(output[space + 2:ab_end])
+        except ValueError:
+            return branch, dirty, 0, 0
+
+    def get_branch(self) -> str | None:
+        """Get current git branch name"""
+        return self.get_all()[0]
+
     def is_dirty(self) -> bool:
         """Check if working directory has uncommitted changes"""
-        try:
-            result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                cwd=self.workspace_dir,
-                capture_output=True,
-                text=True,
-                timeout=1
-            )
-            return bool(result.stdout.strip()) if result.returncode == 0 else False
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+        return self.get_all()[1]
 
     def get_remote_status(self) -> tuple[int, int]:
         """Get commits ahead/behind remote (returns ahead, behind)"""
-        try:
-            result = subprocess.run(
-                ['git', 'rev-list', '--left-right', '--count', 'HEAD...@{upstream}'],
-                cwd=self.workspace_dir,
-                capture_output=True,
-                text=True,
-                timeout=1
-            )
-            if result.returncode == 0:
-                parts = result.stdout.strip().split()
-                if len(parts) == 2:
-                    return int(parts[0]), int(parts[1])
-        except (subprocess.TimeoutExpired, FileNotFoundError, ValueError):
-            pass
-        return 0, 0
+        _, _, ahead, behind = self.get_all()
+        return ahead, behind
 
 
 class StatusLine:
@@ -174,30 +527,62 @@ class StatusLine:
     CYAN = '\033[36m'
     MAGENTA = '\033[35m'
 
-    def __init__(self, data: Dict[str, Any], config: Config, transcript: Optional[TranscriptParser] = None):
+    def __init__(self, data: dict, config: Config, transcript: TranscriptParser | None = None):
         self.data = data
         self.config = config
         self.transcript = transcript
         self.use_color = config.get('colors')
-
-    def _c(self, color: str, text: str) -> str:
-        """Apply color to text if colors enabled"""
-        return f"{color}{text}{self.RESET}" if self.use_color else text
+        self.icons = config.get('icons')
+
+        # One painter per color, specialized up front so each call is a single format
+        # with no use_color check and no color argument
+        self._blue_bold = self._painter(self.BLUE + self.BOLD)
+        self._magenta = self._painter(self.MAGENTA)
+        self._green = self._painter(self.GREEN)
+        self._yellow = self._painter(self.YELLOW)
+        self._red = self._painter(self.RED)
+        self._cyan = self._painter(self.CYAN)
+        self._dim = self._painter(self.DIM)
+
+        # Static labels rendered on every call
+        self._tokens_label = self._dim('tokens:')
+        self._session_label = self._dim('session:')
+        self._response_label = self._dim('response:')
+
+    def _painter(self, color: str) -> Callable[[str], str]:
+        """Build a function that wraps text in the given color, if colors are enabled"""
+        if not self.use_color:
+            return self._plain
+
+        reset = self.RESET
+
+        def paint(text: str) -> str:
+            return f"{color}{text}{reset}"
+        return paint
+
+    @staticmethod
+    def _plain(text: str) -> str:
+        """Return text unchanged when colors are disabled"""
+        return text
 
     def _format_workspace(self) -> str:
         """Format workspace/directory name"""
         workspace = self.data.get('workspace', {})
         current_dir = workspace.get('current_dir', '~')
         dir_name = Path(current_dir).name or current_dir
-        return self._c(self.BLUE + self.BOLD, dir_name)
+        return self._blue_bold(dir_name)
 
     def _format_git_status(self) -> str:
         """Format git branch and status indicators"""
         workspace = self.data.get('workspace', {})
         current_dir = workspace.get('current_dir', '.')
 
+        # Avoid spawning git at all outside a repository
         git = GitInfo(current_dir)
-        branch = git.get_branch()
+        if git.git_dir is None:
+            return ""
+
+        branch, dirty, ahead, behind = git.get_all()
 
         if not branch:
             return ""
@@ -205,24 +590,23 @@ class StatusLine:
         indicators = []
 
         # Dirty/clean indicator
-        if git.is_dirty():
-            icon = self.config.get('icons', 'dirty') or '🚧'
-            indicators.append(self._c(self.RED, icon))
+        if dirty:
+            icon = self.icons.get('dirty') or '🚧'
+            indicators.append(self._red(icon))
         else:
-            icon = self.config.get('icons', 'clean') or '✅'
-            indicators.append(self._c(self.GREEN, icon))
+            icon = self.icons.get('clean') or '✅'
+            indicators.append(self._green(icon))
 
         # Remote tracking
-        ahead, behind = git.get_remote_status()
         if ahead > 0:
-            icon = self.config.get('icons', 'ahead') or '⇡'
-            indicators.append(self._c(self.CYAN, f'{icon}{ahead}'))
+            icon = self.icons.get('ahead') or '⇡'
+            indicators.append(self._cyan(f'{icon}{ahead}'))
         if behind > 0:
-            icon = self.config.get('icons', 'behind') or '⇣'
-            indicators.append(self._c(self.YELLOW, f'{icon}{behind}'))
+            icon = self.icons.get('behind') or '⇣'
+            indicators.append(self._yellow(f'{icon}{behind}'))
 
         status_str = ''.join(indicators)
-        branch_colored = self._c(self.MAGENTA, branch)
+        branch_colored = self._magenta(branch)
 
         return f"{branch_colored}{status_str}"
 
@@ -230,7 +614,7 @@ class StatusLine:
         """Format model name"""
         model = self.data.get('model', {})
         display_name = model.get('display_name', 'Unknown')
-        return self._c(self.CYAN, display_name)
+        return self._cyan(display_name)
 
     def _format_tokens(self) -> str:
         """Format token usage"""
@@ -250,48 +634,45 @@ class StatusLine:
         context_limit = 1000000 if '1m' in model_id.lower() else 200000
 
         tokens_pct = (total_tokens / context_limit) * 100
-        color = self.GREEN if tokens_pct < 50 else (self.YELLOW if tokens_pct < 80 else self.RED)
+        paint = self._green if tokens_pct < 50 else (self._yellow if tokens_pct < 80 else self._red)
 
         # Format token count
         if total_tokens >= 1000:
-            token_str = f"{total_tokens/1000:.0f}k"
+            token_str = f"{round(total_tokens / 1000)}k"
         else:
             token_str = str(total_tokens)
 
         # Add warning emoji if usage is high
         warning = ""
         if tokens_pct > 60:
-            icon = self.config.get('icons', 'high_usage') or '⚠️'
-            warning = self._c(self.YELLOW, icon)
+            icon = self.icons.get('high_usage') or '⚠️'
+            warning = self._yellow(icon)
 
-        return f"{self._c(self.DIM, 'tokens:')} {self._c(color, f'{tokens_pct:.0f}%')} ({token_str}){warning}"
+        # round() matches the old '.0f' output but formats as an int, which is cheaper
+        return ''.join((
+            self._tokens_label, ' ',
+            paint(f'{round(tokens_pct)}%'),
+            ' (', token_str, ')', warning,
+        ))
 
     def _format_session(self) -> str:
         """Format session duration"""
         if not self.transcript:
             return ""
 
-        start_time = self.transcript.get('session_start_time')
-        if not start_time:
+        start_epoch = self.transcript.get('session_start_epoch')
+        if start_epoch is None:
             return ""
 
-        try:
-            start_time_clean = start_time.replace('Z', '+00:00')
-            start = datetime.fromisoformat(start_time_clean)
-            if start.tzinfo:
-                start = start.replace(tzinfo=None)
-            duration = datetime.now() - start
-            hours = int(duration.total_seconds() // 3600)
-            minutes = int((duration.total_seconds() % 3600) // 60)
-
-            if hours > 0:
-                time_str = f"{hours}h{minutes}m"
-            else:
-                time_str = f"{minutes}m"
-
-            return f"{self._c(self.DIM, 'session:')} {self._c(self.CYAN, time_str)}"
-        except (ValueError, AttributeError):
-            return ""
+        hours, seconds = divmod(max(int(time.time() - start_epoch), 0), 3600)
+        minutes = seconds // 60
+
+        if hours > 0:
+            time_str = f"{hours}h{minutes}m"
+        else:
+            time_str = f"{minutes}m"
+
+        return f"{self._session_label} {self._cyan(time_str)}"
 
     def _format_response_time(self) -> str:
         """Format average API response time"""
@@ -306,13 +687,13 @@ class StatusLine:
 
         # Color based on response time
         if avg_ms < 5000:
-            color = self.CYAN
+            paint = self._cyan
         elif avg_ms < 10000:
-            color = self.YELLOW
+            paint = self._yellow
         else:
-            color = self.RED
+            paint = self._red
 
-        return f"{self._c(self.DIM, 'response:')} {self._c(color, f'{avg_ms}ms')}"
+        return f"{self._response_label} {paint(f'{avg_ms}ms')}"
 
     def format(self) -> str:
         """Generate the single-line status display"""
@@ -326,22 +707,113 @@ class StatusLine:
         ]
 
         # Filter out empty parts
-        return ' | '.join(p for p in parts if p)
+        return ' | '.join([p for p in parts if p])
+
+
+def render(data: dict) -> str:
+    """Build the status line for one Claude Code JSON payload"""
+    config = Config()
+
+    # Parse transcript file for detailed metrics
+    transcript_path = data.get('transcript_path')
+    transcript = TranscriptParser(transcript_path) if transcript_path else None
+
+    return StatusLine(data, config, transcript).format()
+
+
+def default_socket_path() -> str:
+    """Socket used by --daemon; statusline_client.c computes the same path"""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'claude_statusline.sock')
+    # A shared temp dir gets a private subdirectory, so no other user can bind the socket first
+    tmp_dir = os.environ.get('TMPDIR') or '/tmp'
+    return os.path.join(tmp_dir, f'claude_statusline-{os.getuid()}', 'daemon.sock')
+
+
+def serve(socket_path: str):
+    """Answer render requests on a Unix socket, one JSON payload per connection"""
+    import signal
+    import socket
+    import socketserver
+
+    class RenderHandler(socketserver.StreamRequestHandler):
+        # Don't let a stuck client block the (single-threaded) server
+        timeout = 2
+
+        def handle(self):
+            try:
+                output = render(json_loads(self.rfile.read()))
+            except Exception as e:
+                # Reply with nothing; the client falls back to running the script directly
+                print(f"Error: {e}", file=sys.stderr)
+                return
+            self.wfile.write(output.encode() + b'\n')
+
+    # The client only trusts sockets in a directory nobody else can get into
+    socket_dir = os.path.dirname(os.path.abspath(socket_path))
+    try:
+        os.mkdir(socket_dir, 0o700)
+    except OSError:
+        pass
+    if not _is_private_dir(socket_dir):
+        print(f"Error: {socket_dir} must be a directory only you can access", file=sys.stderr)
+        sys.exit(1)
+
+    # Replace a socket left behind by a daemon that was killed, but not a live one, and never
+    # anything that isn't a socket of ours
+    try:
+        stat = os.lstat(socket_path)
+    except FileNotFoundError:
+        stat = None
+    if stat is not None:
+        if not S_ISSOCK(stat.st_mode) or stat.st_uid != os.getuid():
+            print(f"Error: {socket_path} exists and is not our socket", file=sys.stderr)
+            sys.exit(1)
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+        else:
+            print(f"Error: daemon already listening on {socket_path}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            probe.close()
+
+    # Only the owner may connect: requests make the daemon read files and run git
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(socket_path, RenderHandler)
+    finally:
+        os.umask(old_umask)
+
+    # Exit through the cleanup below on a plain `kill` too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
 
 
 def main():
     """Main entry point"""
-    try:
-        data = json.load(sys.stdin)
-        config = Config()
+    if len(sys.argv) > 1 and sys.argv[1] == '--daemon':
+        serve(sys.argv[2] if len(sys.argv) > 2 else default_socket_path())
+        return
 
-        # Parse transcript file for detailed metrics
-        transcript_path = data.get('transcript_path')
-        transcript = TranscriptParser(transcript_path) if transcript_path else None
+    try:
+        data = json_loads(sys.stdin.buffer.read())
 
         # Generate and print status line
-        statusline = StatusLine(data, config, transcript)
-        print(statusline.format())
+        print(render(data))
 
     except json.JSONDecodeError as e:
         print(f"Error parsing JSON: {e}", file=sys.stderr)
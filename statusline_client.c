@@ -0,0 +1,194 @@
+/*
+ * Claude Code Status Line client
+ *
+ * Forwards the JSON on stdin to a running `statusline.py --daemon` and prints its reply,
+ * so each render skips Python interpreter startup. If the daemon isn't running or
+ * doesn't answer, it runs statusline.py directly with the same input instead.
+ *
+ * Build: cc -O2 -o statusline-client statusline_client.c
+ * Usage: statusline-client /path/to/statusline.py
+ */
+
+#include <signal.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/socket.h>
+#include <sys/stat.h>
+#include <sys/time.h>
+#include <sys/un.h>
+#include <unistd.h>
+
+/* Give up on the daemon after this long and render locally instead */
+#define DAEMON_TIMEOUT_SEC 2
+
+static char *read_all(int fd, size_t *len)
+{
+    size_t cap = 4096, used = 0;
+    char *buf = malloc(cap);
+
+    while (buf) {
+        if (used == cap) {
+            char *grown = realloc(buf, cap *= 2);
+            if (!grown) {
+                break;
+            }
+            buf = grown;
+        }
+        ssize_t n = read(fd, buf + used, cap - used);
+        if (n == 0) {
+            *len = used;
+            return buf;
+        }
+        if (n < 0) {
+            break;
+        }
+        used += (size_t)n;
+    }
+    free(buf);
+    return NULL;
+}
+
+static int write_all(int fd, const char *buf, size_t len)
+{
+    while (len > 0) {
+        ssize_t n = write(fd, buf, len);
+        if (n < 0) {
+            return -1;
+        }
+        buf += n;
+        len -= (size_t)n;
+    }
+    return 0;
+}
+
+/* Must match default_socket_path() in statusline.py */
+static int socket_path(char *out, size_t size)
+{
+    const char *runtime_dir = getenv("XDG_RUNTIME_DIR");
+    if (runtime_dir && *runtime_dir) {
+        return snprintf(out, size, "%s/claude_statusline.sock", runtime_dir) < (int)size;
+    }
+    const char *tmp_dir = getenv("TMPDIR");
+    if (!tmp_dir || !*tmp_dir) {
+        tmp_dir = "/tmp";
+    }
+    return snprintf(out, size, "%s/claude_statusline-%d/daemon.sock",
+                    tmp_dir, (int)getuid()) < (int)size;
+}
+
+/* Only talk to a socket we own, in a directory nobody else can get into, so another user
+ * can't stand in for the daemon and receive our session details */
+static int trusted(const char *path)
+{
+    struct stat st;
+    char dir[sizeof ((struct sockaddr_un *)0)->sun_path];
+    uid_t uid = getuid();
+
+    if (lstat(path, &st) < 0 || !S_ISSOCK(st.st_mode) || st.st_uid != uid) {
+        return 0;
+    }
+
+    snprintf(dir, sizeof dir, "%s", path);
+    char *slash = strrchr(dir, '/');
+    if (!slash || slash == dir) {
+        return 0;
+    }
+    *slash = '\0';
+    return lstat(dir, &st) == 0 && S_ISDIR(st.st_mode) && st.st_uid == uid
+        && !(st.st_mode & (S_IRWXG | S_IRWXO));
+}
+
+/* Returns 0 once the daemon's reply has been printed, -1 to fall back */
+static int via_daemon(const char *request, size_t len)
+{
+    struct sockaddr_un addr;
+    struct timeval timeout = { DAEMON_TIMEOUT_SEC, 0 };
+
+    memset(&addr, 0, sizeof addr);
+    addr.sun_family = AF_UNIX;
+    if (!socket_path(addr.sun_path, sizeof addr.sun_path) || !trusted(addr.sun_path)) {
+        return -1;
+    }
+
+    int fd = socket(AF_UNIX, SOCK_STREAM, 0);
+    if (fd < 0) {
+        return -1;
+    }
+    setsockopt(fd, SOL_SOCKET, SO_RCVTIMEO, &timeout, sizeof timeout);
+    setsockopt(fd, SOL_SOCKET, SO_SNDTIMEO, &timeout, sizeof timeout);
+
+    if (connect(fd, (struct sockaddr *)&addr, sizeof addr) < 0
+            || write_all(fd, request, len) < 0
+            || shutdown(fd, SHUT_WR) < 0) {
+        close(fd);
+        return -1;
+    }
+
+    size_t reply_len;
+    char *reply = read_all(fd, &reply_len);
+    close(fd);
+
+    /* An empty reply means the daemon hit an error; let the script report it */
+    if (!reply || reply_len == 0) {
+        free(reply);
+        return -1;
+    }
+    write_all(STDOUT_FILENO, reply, reply_len);
+    free(reply);
+    return 0;
+}
+
+static void run_script(const char *script, const char *request, size_t len)
+{
+    int fds[2];
+
+    if (pipe(fds) < 0) {
+        perror("pipe");
+        exit(1);
+    }
+
+    /* stdin was already consumed, so replay the request to the script through a pipe */
+    pid_t pid = fork();
+    if (pid < 0) {
+        perror("fork");
+        exit(1);
+    }
+    if (pid == 0) {
+        close(fds[0]);
+        _exit(write_all(fds[1], request, len) < 0);
+    }
+
+    close(fds[1]);
+    dup2(fds[0], STDIN_FILENO);
+    close(fds[0]);
+
+    signal(SIGPIPE, SIG_DFL);
+    execlp("python3", "python3", script, (char *)NULL);
+    perror("python3");
+    exit(1);
+}
+
+int main(int argc, char **argv)
+{
+    if (argc != 2) {
+        fprintf(stderr, "usage: %s /path/to/statusline.py\n", argv[0]);
+        return 2;
+    }
+
+    /* A daemon that goes away mid-request must not kill us before the fallback */
+    signal(SIGPIPE, SIG_IGN);
+
+    size_t len;
+    char *request = read_all(STDIN_FILENO, &len);
+    if (!request) {
+        perror("read");
+        return 1;
+    }
+
+    if (via_daemon(request, len) == 0) {
+        return 0;
+    }
+    run_script(argv[1], request, len);
+    return 1;
+}
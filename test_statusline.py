@@ -4,18 +4,25 @@ Test script to preview statusline output with sample data
 """
 
 import json
+import os
+import shutil
 import subprocess
 import tempfile
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+# Keep mock transcripts and the caches statusline.py writes out of the real temp dir
+TEST_TMPDIR = tempfile.mkdtemp(prefix='statusline_test_')
+tempfile.tempdir = TEST_TMPDIR
+os.environ['TMPDIR'] = TEST_TMPDIR
+
 # Create a mock transcript file with sample session data
 def create_mock_transcript():
     """Create a temporary transcript file with realistic test data"""
     transcript_file = tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False)
 
     # Session started 2 hours 37 minutes ago
-    session_start = datetime.now() - timedelta(hours=2, minutes=37)
+    session_start = datetime.now(timezone.utc) - timedelta(hours=2, minutes=37)
 
     # Simulate 10 exchanges (20 messages total)
     for i in range(10):
@@ -25,7 +32,7 @@ def create_mock_transcript():
         user_msg = {
             "type": "user",
             "uuid": f"user-{i}",
-            "timestamp": msg_time.isoformat() + "Z",
+            "timestamp": msg_time.isoformat().replace("+00:00", "Z"),
             "message": {"role": "user", "content": "test message"}
         }
         transcript_file.write(json.dumps(user_msg) + '\n')
@@ -34,7 +41,7 @@ def create_mock_transcript():
         assistant_msg = {
             "type": "assistant",
             "uuid": f"assistant-{i}",
-            "timestamp": (msg_time + timedelta(seconds=30)).isoformat() + "Z",
+            "timestamp": (msg_time + timedelta(seconds=30)).isoformat().replace("+00:00", "Z"),
             "message": {
                 "role": "assistant",
                 "usage": {
@@ -98,3 +105,111 @@ if result.stderr:
 
 # Clean up mock transcript file
 Path(transcript_path).unlink(missing_ok=True)
+
+
+def check_nested_entries():
+    """Only top-level assistant entries count, not ones nested in progress or tool input"""
+    from statusline import TranscriptParser
+
+    lines = [
+        {"type": "assistant", "timestamp": "2025-01-01T00:00:00Z",
+         "message": {"usage": {"input_tokens": 10, "output_tokens": 20}}},
+        # Subagent progress wraps a whole assistant entry
+        {"type": "progress", "data": {"message": {"type": "assistant", "message": {
+            "usage": {"input_tokens": 5000, "output_tokens": 700}}}}},
+        # Tool input that happens to use the same key names, ahead of the real usage
+        {"type": "assistant", "message": {
+            "content": [{"type": "tool_use", "input": {"input_tokens": 1000000}}],
+            "usage": {"input_tokens": 1, "output_tokens": 2}}},
+    ]
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False) as f:
+        for line in lines:
+            f.write(json.dumps(line) + '\n')
+
+    try:
+        transcript = TranscriptParser(f.name)
+        assert transcript.get('total_input_tokens') == 11, transcript.metrics
+        assert transcript.get('total_output_tokens') == 22, transcript.metrics
+        assert transcript.get('assistant_message_count') == 2, transcript.metrics
+    finally:
+        Path(f.name).unlink(missing_ok=True)
+
+
+def check_incremental_parse():
+    """Resume from the cached offset, re-read an unfinished last line, reparse a shrunk file"""
+    from statusline import TranscriptParser
+
+    def assistant(tokens):
+        return json.dumps({"type": "assistant", "timestamp": "2025-01-01T00:00:00Z",
+                           "message": {"usage": {"input_tokens": tokens, "output_tokens": 1}}})
+
+    def input_tokens():
+        return TranscriptParser(str(path)).get('total_input_tokens')
+
+    path = Path(TEST_TMPDIR, 'incremental.jsonl')
+    path.write_text(assistant(10) + '\n' + assistant(20) + '\n')
+    assert input_tokens() == 30
+    assert list(Path(TEST_TMPDIR).glob('claude_statusline-*/claude_statusline_tx_*.json'))
+
+    # Rewrite a parsed line in place at the same size: only a full reparse would notice
+    path.write_text(assistant(11) + '\n' + assistant(20) + '\n')
+    with open(path, 'a') as f:
+        f.write(assistant(40) + '\n')
+    assert input_tokens() == 70, "should resume from the cached offset"
+
+    # A last line without its newline yet is counted, but the next render reads it again
+    with open(path, 'a') as f:
+        f.write(assistant(100))
+    assert input_tokens() == 170
+    assert input_tokens() == 170
+    with open(path, 'a') as f:
+        f.write('\n' + assistant(200) + '\n')
+    assert input_tokens() == 370, "completed line should be counted once"
+
+    # A file shorter than the cached offset was rewritten, so it is parsed from the start
+    path.write_text(assistant(5) + '\n')
+    assert input_tokens() == 5
+
+
+def check_git_status_parsing():
+    """Parse porcelain v2 headers into branch, dirty, ahead and behind"""
+    from statusline import GitInfo
+
+    head = b'# branch.oid 0123456789abcdef0123456789abcdef01234567\n'
+    cases = [
+        # Clean, up to date with its upstream
+        (head + b'# branch.head main\n# branch.upstream origin/main\n# branch.ab +0 -0\n',
+         ('main', False, 0, 0)),
+        # Ahead and behind, with changes after the headers
+        (head + b'# branch.head main\n# branch.upstream origin/main\n# branch.ab +12 -3\n'
+         b'1 .M N... 100644 100644 100644 abc abc file.txt\n? new.txt\n',
+         ('main', True, 12, 3)),
+        # Detached HEAD
+        (b'# branch.oid 0123456789abcdef0123456789abcdef01234567\n# branch.head (detached)\n',
+         ('HEAD', False, 0, 0)),
+        # No upstream configured
+        (head + b'# branch.head feature/x\n? untracked.txt\n', ('feature/x', True, 0, 0)),
+        # Upstream that was deleted on the remote: no branch.ab line
+        (head + b'# branch.head old\n# branch.upstream origin/old\n', ('old', False, 0, 0)),
+        # Last line without a trailing newline
+        (head + b'# branch.head main\n# branch.upstream origin/main\n# branch.ab +1 -2',
+         ('main', False, 1, 2)),
+        (head + b'# branch.head main\n1 .M N... 100644 100644 100644 abc abc file.txt',
+         ('main', True, 0, 0)),
+        # New repository before the first commit
+        (b'# branch.oid (initial)\n# branch.head main\n', ('main', False, 0, 0)),
+        (b'', (None, False, 0, 0)),
+    ]
+    for output, expected in cases:
+        assert GitInfo._parse_status(output) == expected, (output, GitInfo._parse_status(output))
+
+
+try:
+    check_nested_entries()
+    print("Nested transcript entries: OK")
+    check_incremental_parse()
+    print("Incremental transcript parsing: OK")
+    check_git_status_parsing()
+    print("Git status parsing: OK")
+finally:
+    shutil.rmtree(TEST_TMPDIR, ignore_errors=True)